@@ -0,0 +1,54 @@
+import os
+import datetime as dt
+import numpy as np
+import pandas as pd
+
+from opendss_wrapper import OpenDSS
+
+pd.set_option('display.precision', 3)      # precision in print statements
+pd.set_option('expand_frame_repr', False)  # Keeps results on 1 line
+pd.set_option('display.max_rows', 30)      # Shows up to 30 rows of data
+
+"""
+Script to run an N-1 contingency screening on the IEEE13 test feeder
+"""
+
+if __name__ == '__main__':
+    # Path variables
+    this_dir = os.path.abspath(os.path.dirname(__file__))
+    master_dss_file = os.path.join(this_dir, 'IEEE13Nodeckt.dss')
+
+    # Timing variables
+    time_res = dt.timedelta(minutes=15)
+    start_time = dt.datetime(2019, 1, 1)
+
+    # Create OpenDSS Object
+    feeder = OpenDSS(master_dss_file, time_res, start_time)
+
+    # Change the circuit after compiling, these changes are copied to the worker processes
+    for load_name in feeder.get_all_elements().index.str.replace('Load.', ''):
+        p, q = feeder.get_power(load_name, total=True)
+        feeder.set_power(load_name, p=p * 0.8, q=q * 0.8)
+    feeder.set_tap('reg1', 4)
+    feeder.run_dss()
+
+    # Run all line, transformer, and capacitor outages, serially and in parallel
+    violations, summary = feeder.run_contingencies(processes=1)
+    print('Contingencies, ranked by severity:')
+    print(summary)
+    print()
+    print('Most violated nodes and elements:')
+    print((violations > 0).sum().sort_values(ascending=False).head(10))
+    print()
+
+    violations_parallel, summary_parallel = feeder.run_contingencies(processes=4)
+    assert (summary_parallel.index == summary.index).all()
+    assert np.allclose(summary_parallel['Severity'], summary['Severity'], atol=0.01, equal_nan=True)
+    print('Parallel results match serial results')
+    print()
+
+    # Run a subset of contingencies
+    elements = [('650632', 'Line'), ('reg1', 'Xfmr')]
+    violations, summary = feeder.run_contingencies(elements, v_min=0.9, v_max=1.1, processes=1)
+    print('Contingencies with wider voltage limits:')
+    print(summary)
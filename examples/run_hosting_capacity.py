@@ -0,0 +1,57 @@
+import os
+import datetime as dt
+import numpy as np
+import pandas as pd
+
+from opendss_wrapper import OpenDSS, get_hosting_capacity
+
+pd.set_option('display.precision', 3)      # precision in print statements
+pd.set_option('expand_frame_repr', False)  # Keeps results on 1 line
+pd.set_option('display.max_rows', 30)      # Shows up to 30 rows of data
+
+"""
+Script to run a PV hosting capacity analysis by bus on the IEEE13 test feeder
+"""
+
+if __name__ == '__main__':
+    # Path variables
+    this_dir = os.path.abspath(os.path.dirname(__file__))
+    master_dss_file = os.path.join(this_dir, 'IEEE13Nodeckt.dss')
+
+    # Timing variables
+    time_res = dt.timedelta(minutes=15)
+    start_time = dt.datetime(2019, 1, 1, 12)
+
+    # Create OpenDSS Object
+    feeder = OpenDSS(master_dss_file, time_res, start_time)
+
+    # Reduce the loads for a midday case, these changes are copied to the worker processes
+    for load_name in feeder.get_all_elements().index.str.replace('Load.', ''):
+        p, q = feeder.get_power(load_name, total=True)
+        feeder.set_power(load_name, p=p * 0.5, q=q * 0.5)
+    feeder.run_dss()
+    v_before = feeder.get_all_node_voltages()
+
+    # Run hosting capacity for all buses
+    df = get_hosting_capacity(feeder, processes=1)
+    print('Hosting capacity by bus:')
+    print(df.sort_values('Hosting Capacity (kW)'))
+    print()
+    print('Limiting constraints:')
+    print(df['Limiting Constraint'].value_counts())
+    print()
+
+    # The feeder state is not changed by the analysis
+    assert np.allclose(feeder.get_all_node_voltages(), v_before)
+
+    # Run in parallel, results match the serial analysis
+    df_parallel = get_hosting_capacity(feeder, processes=4)
+    assert np.allclose(df_parallel['Hosting Capacity (kW)'], df['Hosting Capacity (kW)'], atol=10)
+    print('Parallel results match serial results')
+    print()
+
+    # Run a subset of buses with stricter limits
+    df = get_hosting_capacity(feeder, buses=['675', '680', '692'], v_max=1.03, max_loading=80, tolerance=1,
+                              processes=1)
+    print('Hosting capacity with stricter limits:')
+    print(df)
@@ -0,0 +1,79 @@
+import os
+import shutil
+import tempfile
+import datetime as dt
+import numpy as np
+import pandas as pd
+
+from opendss_wrapper import OpenDSS, ProfilePipeline
+
+pd.set_option('display.precision', 3)      # precision in print statements
+pd.set_option('expand_frame_repr', False)  # Keeps results on 1 line
+pd.set_option('display.max_rows', 30)      # Shows up to 30 rows of data
+
+"""
+Script to run the IEEE13 test feeder with load profiles that are read in chunks
+"""
+
+# Path variables
+this_dir = os.path.abspath(os.path.dirname(__file__))
+master_dss_file = os.path.join(this_dir, 'IEEE13Nodeckt.dss')
+profile_dir = tempfile.mkdtemp()
+
+# Timing variables
+time_res = dt.timedelta(minutes=15)
+start_time = dt.datetime(2019, 1, 1, 6)
+end_time = dt.datetime(2019, 1, 1, 9)
+
+# Create OpenDSS Object
+feeder = OpenDSS(master_dss_file, time_res, start_time)
+
+# Create 1-minute load profiles for 1 day, scaled from the original load powers
+loads = feeder.get_all_elements()
+load_names = loads.index.str.replace('Load.', '').tolist()
+p_rated = np.array([feeder.get_power(name, total=True)[0] for name in load_names])
+profile_times = pd.date_range(dt.datetime(2019, 1, 1), periods=24 * 60, freq='1min')
+hour = profile_times.hour + profile_times.minute / 60
+shape = 0.6 + 0.3 * np.sin((hour - 9) / 24 * 2 * np.pi)
+noise = np.random.default_rng(0).normal(1, 0.05, (len(profile_times), len(load_names)))
+df_profiles = pd.DataFrame(shape.values[:, None] * noise * p_rated, index=profile_times, columns=load_names)
+df_profiles.index.name = 'Time'
+
+csv_file = os.path.join(profile_dir, 'load_profiles.csv')
+npy_file = os.path.join(profile_dir, 'load_profiles.npy')
+df_profiles.to_csv(csv_file)
+np.save(npy_file, df_profiles.values)
+
+# Run simulation from the CSV profiles, averaging the 1-minute data in each time step
+pipeline = ProfilePipeline(feeder, csv_file, {name: name for name in load_names}, end_time=end_time, method='mean',
+                           chunk_size=60)
+results = []
+for t, setpoints in pipeline:
+    pipeline.set_powers(setpoints)
+    feeder.run_dss()
+    results.append({
+        'Time': t,
+        'Total Load (kW)': setpoints.sum(),
+        'Feeder Power (kW)': feeder.get_circuit_power()[0],
+        'Min Voltage (p.u.)': feeder.get_all_node_voltages().min(),
+    })
+df = pd.DataFrame(results).set_index('Time')
+print('Results from CSV profiles (15-minute averages):')
+print(df)
+print()
+
+# Setpoints match the averaged profiles
+expected = df_profiles.loc[start_time: end_time - dt.timedelta(minutes=1)].resample(time_res).mean()
+assert (df.index == expected.index).all()
+assert np.allclose(df['Total Load (kW)'], expected.sum(axis=1))
+
+# Read the same profiles from a memory-mapped .npy file, with the latest value at each time step
+pipeline = ProfilePipeline(feeder, npy_file, dict(enumerate(load_names)), end_time=end_time, method='ffill',
+                           data_start=profile_times[0], data_time_step='1min')
+setpoints = pd.DataFrame(dict(pipeline), index=load_names).T
+print('Load setpoints from .npy profiles:')
+print(setpoints.iloc[:, :5])
+assert np.allclose(setpoints, df_profiles.loc[setpoints.index])
+
+# Remove the profile files
+shutil.rmtree(profile_dir)
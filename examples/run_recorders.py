@@ -0,0 +1,72 @@
+import os
+import datetime as dt
+import numpy as np
+import pandas as pd
+
+from opendss_wrapper import OpenDSS
+
+pd.set_option('display.precision', 3)      # precision in print statements
+pd.set_option('expand_frame_repr', False)  # Keeps results on 1 line
+pd.set_option('display.max_rows', 30)      # Shows up to 30 rows of data
+
+"""
+Script to record results with OpenDSS monitors and energy meters on the IEEE13 test feeder
+"""
+
+# Path variables
+this_dir = os.path.abspath(os.path.dirname(__file__))
+master_dss_file = os.path.join(this_dir, 'IEEE13Nodeckt.dss')
+
+# Timing variables
+time_res = dt.timedelta(minutes=15)
+start_time = dt.datetime(2019, 1, 1, 6)
+
+# Create OpenDSS Object
+feeder = OpenDSS(master_dss_file, time_res, start_time)
+
+# Create monitors and an energy meter
+load_name = feeder.get_all_elements().index[0].replace('Load.', '')
+line_name = feeder.get_all_elements('Line').index[0].replace('Line.', '')
+names = feeder.add_recorders([
+    (load_name, 'Load', 'Power', 1),                                # (name, element, mode, terminal)
+    {'name': line_name, 'element': 'Line'},                         # voltages and currents
+    {'name': line_name, 'element': 'Line', 'type': 'EnergyMeter'},  # energy meter at the feeder head
+])
+print('Recorder names:', names)
+print()
+
+# Run simulation for 2 hours, extracting results in 1 hour chunks
+time_range = pd.date_range(start_time, start_time + dt.timedelta(hours=2), freq=time_res, inclusive='left')
+p_load = []
+chunks = []
+for t in time_range:
+    feeder.set_power(load_name, p=1000 + 100 * len(p_load))
+    feeder.run_dss()
+    p_load.append(feeder.get_power(load_name, total=True)[0])
+
+    if len(p_load) % 4 == 0:
+        chunks.append(feeder.get_monitor_data(reset=True))
+        print(f'Energy meter registers, up to time step {t}:')
+        print(feeder.get_energy_meter_data(reset=True).iloc[:, :4])
+        print()
+
+# Monitor times match the simulation times
+df = pd.concat(chunks)
+df_power = df[names[0]]
+print('Load monitor (power by phase):')
+print(df_power)
+print()
+assert (df.index == time_range).all()
+
+# Monitor powers match the getter results
+s = df_power.filter(like='S').values
+angle = np.radians(df_power.filter(like='Ang').values)
+p_monitor = (s * np.cos(angle)).sum(axis=1)
+print('Load power from monitor (kW):', p_monitor.round(1))
+print('Load power from getter (kW): ', np.array(p_load).round(1))
+assert np.allclose(p_monitor, p_load, rtol=1e-4)
+print()
+
+# Monitor data as numpy arrays
+times, data = feeder.get_monitor_data(names[1:2], as_array=True)[names[1]]
+print('Line monitor array shape (after reset):', data.shape)
@@ -0,0 +1,187 @@
+"""
+PV hosting capacity analysis using a single probe generator that is moved between buses
+"""
+
+import opendssdirect as dss
+import numpy as np
+import pandas as pd
+
+PROBE_NAME = 'hc_probe'
+
+
+def add_probe(feeder):
+    # creates the probe generator (disabled, at the source bus) if it does not exist
+    # the probe is only enabled during get_bus_hosting_capacity, so feeder.includes_elements is not changed
+    # probe commands are not recorded in the feeder state, see OpenDSS.get_state
+    if PROBE_NAME in dss.Generators.AllNames():
+        return
+    bus = get_source_bus()
+    feeder.run_command(f'New Generator.{PROBE_NAME} bus1={bus} phases=3 kV={get_bus_kv(bus)} kW=0 pf=1 model=1'
+                       ' yearly=constant enabled=no', record=False)
+
+
+def move_probe(feeder, bus):
+    # moves the probe generator to all nodes of a bus and enables it, with zero power
+    dss.Circuit.SetActiveBus(bus)
+    nodes = dss.Bus.Nodes()
+    bus1 = '.'.join([bus] + [str(node) for node in nodes])
+    feeder.run_command(f'edit Generator.{PROBE_NAME} bus1={bus1} phases={len(nodes)} kV={get_bus_kv(bus)}'
+                       ' kW=0 enabled=yes', record=False)
+
+
+def get_source_bus():
+    dss.Vsources.First()
+    return dss.CktElement.BusNames()[0].split('.')[0]
+
+
+def get_bus_kv(bus):
+    # returns the rated kV for an element connected to all nodes of a bus (line-to-line if multi-phase)
+    dss.Circuit.SetActiveBus(bus)
+    kv = dss.Bus.kVBase()
+    if dss.Bus.NumNodes() > 1:
+        kv *= np.sqrt(3)
+    return kv
+
+
+def get_base_case(feeder):
+    # solves the circuit with the probe disabled, returns a tuple of (node voltages, element loadings)
+    if PROBE_NAME in dss.Generators.AllNames():
+        feeder.run_command(f'edit Generator.{PROBE_NAME} kW=0 enabled=no', record=False)
+    feeder.run_snapshot()
+    return feeder.get_all_node_voltages(), feeder.get_all_loadings()
+
+
+def get_limits(base, v_min=0.95, v_max=1.05, max_loading=100):
+    # returns a tuple of (upper voltage, lower voltage, loading) limits by node/element
+    # quantities that violate a limit in the base case are not limited
+    base_voltages, base_loadings = base
+    v_upper = base_voltages.where(base_voltages <= v_max, np.inf).clip(lower=v_max)
+    v_lower = base_voltages.where(base_voltages >= v_min, -np.inf).clip(upper=v_min)
+    loading_upper = base_loadings.where(base_loadings <= max_loading, np.inf).clip(lower=max_loading)
+    return v_upper, v_lower, loading_upper
+
+
+def check_limits(feeder, limits):
+    # solves the circuit and returns the name of the first violated constraint, or None
+    if not feeder.run_snapshot():
+        return 'Non-convergence'
+    v_upper, v_lower, loading_upper = limits
+
+    voltages = feeder.get_all_node_voltages()
+    if ((voltages - v_upper) > 0).any():
+        return 'Overvoltage'
+    if ((v_lower - voltages) > 0).any():
+        return 'Undervoltage'
+    if ((feeder.get_all_loadings() - loading_upper) > 0).any():
+        return 'Thermal'
+    return None
+
+
+def estimate_capacity(point0, point1, limits):
+    # linear extrapolation of each voltage and loading to its limit, using the results at two probe sizes
+    # each point is a tuple of (probe kW, voltages, loadings). Returns the smallest estimate, or None
+    p0, v0, l0 = point0
+    p1, v1, l1 = point1
+    v_upper, v_lower, loading_upper = limits
+    dv = (v1 - v0) / (p1 - p0)
+    dl = (l1 - l0) / (p1 - p0)
+
+    # loadings that decrease will reverse direction, and are limited after dropping to zero
+    estimates = pd.concat([(v_upper - v1)[dv > 0] / dv[dv > 0],
+                           (v_lower - v1)[dv < 0] / dv[dv < 0],
+                           (loading_upper - l1)[dl > 0] / dl[dl > 0],
+                           (loading_upper + l1)[dl < 0] / -dl[dl < 0]])
+    if len(estimates):
+        return p1 + estimates.min()
+    return None
+
+
+def get_bus_hosting_capacity(feeder, bus, base=None, v_min=0.95, v_max=1.05, max_loading=100, max_kw=10000,
+                             test_kw=100, tolerance=10, max_solves=20):
+    # Returns the hosting capacity of a bus, in kW, as a dict with the limiting constraint and number of solves
+    # The probe is disabled and the base case is re-solved before returning
+    #  - base: tuple of (voltages, loadings) from get_base_case. If None, the base case is solved first. Voltages
+    #    and loadings that violate v_min, v_max, or max_loading in the base case are not checked
+    #  - Probe sizes are chosen by extrapolating voltage and loading sensitivities from the last two solves,
+    #    starting with a test injection of test_kw. If the estimate is not useful, the search steps away from the
+    #    known bounds in increasing steps, and then bisects until the capacity is found within tolerance
+    #  - Limiting constraint is one of: Overvoltage, Undervoltage, Thermal, Non-convergence, Max Size (capacity
+    #    reached max_kw), or Max Solves (capacity is not found after max_solves)
+    if base is None:
+        base = get_base_case(feeder)
+    limits = get_limits(base, v_min, v_max, max_loading)
+
+    add_probe(feeder)
+    move_probe(feeder, bus)
+
+    lower, upper, limit = 0, None, None
+    points = [(0, *base)]
+    candidate = test_kw
+    step = tolerance
+    solves = 0
+    while solves < max_solves:
+        feeder.set_power(PROBE_NAME, p=candidate, element='Generator')
+        violation = check_limits(feeder, limits)
+        solves += 1
+        if violation is None:
+            lower = candidate
+        else:
+            upper, limit = candidate, violation
+        if violation != 'Non-convergence':
+            points = [points[-1], (candidate, feeder.get_all_node_voltages(), feeder.get_all_loadings())]
+
+        if upper is not None and upper - lower <= tolerance:
+            break
+        if upper is None and lower >= max_kw:
+            limit = 'Max Size'
+            break
+
+        # use the estimate if it is between the bounds, otherwise step away from the closest bound
+        estimate = estimate_capacity(*points, limits) if violation != 'Non-convergence' else None
+        upper_bound = max_kw if upper is None else upper
+        if estimate is not None and lower + tolerance / 2 < estimate < upper_bound - tolerance / 2:
+            candidate = estimate
+            step = tolerance
+        elif upper is None and estimate is not None and estimate >= max_kw - tolerance / 2:
+            candidate = max_kw
+        elif upper is None:
+            if estimate is None:
+                step = max(step, lower)
+            candidate = min(lower + step, max_kw)
+            step *= 2
+        elif estimate is not None and estimate >= upper_bound - tolerance / 2 and upper - step > lower:
+            candidate = upper - step
+            step *= 2
+        elif estimate is not None and estimate <= lower + tolerance / 2 and lower + step < upper:
+            candidate = lower + step
+            step *= 2
+        else:
+            candidate = (lower + upper) / 2
+    else:
+        limit = 'Max Solves'
+
+    # disable the probe and restore the base solution
+    feeder.run_command(f'edit Generator.{PROBE_NAME} kW=0 enabled=no', record=False)
+    feeder.run_snapshot()
+    return {
+        'Bus': bus,
+        'Hosting Capacity (kW)': lower,
+        'Limiting Constraint': limit,
+        'Solves': solves,
+    }
+
+
+def get_hosting_capacity(feeder, buses=None, processes=None, **kwargs):
+    # Runs a hosting capacity analysis at the present simulation time, returns a DataFrame indexed by bus
+    #  - buses: list of bus names. Default is all buses except the source bus
+    #  - processes: number of worker processes for batches of buses, see OpenDSS.run_parallel. Workers copy the
+    #    feeder state, so the base case is the same in each process
+    #  - kwargs are passed to get_bus_hosting_capacity
+    if buses is None:
+        source_bus = get_source_bus()
+        buses = [bus for bus in feeder.get_all_buses() if bus != source_bus]
+
+    base = get_base_case(feeder)
+    results = feeder.run_parallel(get_bus_hosting_capacity, buses, processes, base=base, **kwargs)
+
+    return pd.DataFrame(results).set_index('Bus')
@@ -1,5 +1,7 @@
+import os
 import opendssdirect as dss
 import datetime as dt
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import pandas as pd
 
@@ -15,6 +17,36 @@ ELEMENT_CLASSES = {
 }
 LINE_CLASSES = ['Line', 'Xfmr', 'Capacitor']
 
+MONITOR_MODES = {
+    'VI': 0,  # Voltages and currents
+    'Power': 1,
+    'Tap': 2,  # Transformer taps
+    'State': 3,  # State variables
+    'Flicker': 4,
+    'Solution': 5,  # Solution variables (iterations, etc.)
+    'Capacitor': 6,  # Capacitor switching
+    'Storage': 7,  # Storage state variables
+    'Winding Currents': 8,
+    'Losses': 9,
+    'Winding Voltages': 10,
+}
+# Element properties that can change after compiling, copied to worker processes (see OpenDSS.get_state)
+STATE_PROPERTIES = {
+    'Load': ['kW', 'kvar'],
+    'PV': ['Pmpp', 'Irradiance', 'kvar'],
+    'Generator': ['kW', 'kvar'],
+    'Capacitor': ['States'],
+    'RegControl': ['TapNumber'],
+    'CapControl': ['PTRatio'],
+}
+STORAGE_PROPERTIES = ['State', '%Charge', '%Discharge', 'PF', '%Stored']
+
+ISLAND_VOLTAGE = 0.01  # p.u. voltage below which a node is considered de-energized
+VOLTAGE_TOLERANCE = 1e-4  # p.u. change in voltage violations that is ignored in contingency analysis
+LOADING_TOLERANCE = 0.1  # percent change in loading violations that is ignored in contingency analysis
+
+MONITOR_HEADER_SIZE = 272  # bytes before the first monitor record (4 integers + 256 character header)
+
 STATUS_ERRORS = [
     'Error',
     'Unknown',
@@ -32,12 +64,20 @@ class OpenDSS:
     def __init__(self, redirects, time_step, start_time, fail_on_error=True, **kwargs):
         self.dss = dss
         self.fail_on_error = fail_on_error
+        self.time_step = time_step
+        self.start_time = start_time
+        self.redirects = redirects if isinstance(redirects, list) else [redirects]
+
+        # commands run after compiling, replayed in worker processes (see get_state)
+        self.commands = None
+
+        # monitors and energy meters created by the wrapper, by name
+        self.monitors = {}
+        self.energy_meters = {}
 
         # Run redirect files before main dss file
         self.print('Compiling...')
-        if not isinstance(redirects, list):
-            redirects = [redirects]
-        for redirect in redirects:
+        for redirect in self.redirects:
             self.redirect(redirect)
 
         # add constant loadshape to remove existing loadshapes
@@ -67,9 +107,13 @@ class OpenDSS:
         self.run_dss()
         dss.Solution.StepSize(time_step.total_seconds())
 
+        self.commands = []
         self.print(f'Compiled Circuit: {dss.Circuit.Name()}')
 
-    def run_command(self, cmd):
+    def run_command(self, cmd, record=True):
+        # if record is True, the command is replayed in worker processes (see run_parallel)
+        if record and self.commands is not None:
+            self.commands.append(cmd)
         status = dss.run_command(cmd)
         if status:
             if any([error in status for error in STATUS_ERRORS]):
@@ -97,9 +141,137 @@ class OpenDSS:
                 dss.Circuit.UpdateStorage()
 
         except Exception as e:
-            self.run_command('export Eventlog')
+            self.run_command('export Eventlog', record=False)
             raise e
 
+    @staticmethod
+    def run_snapshot():
+        # Solves the present state without advancing time, running controls, or updating storage
+        # Returns True if the solution converged. Does not raise errors, e.g. for screening studies
+        try:
+            dss.Solution.SolveNoControl()
+            return bool(dss.Solution.Converged())
+        except Exception:
+            return False
+
+    def run_parallel(self, func, cases, processes=None, **kwargs):
+        # Runs func(feeder, *case, **kwargs) for each case and returns a list of the results, in order
+        #  - If processes=1: runs serially using this object
+        #  - Otherwise, runs in a pool of worker processes (default: 1 per CPU). Each worker compiles its own copy of
+        #    the circuit from the redirect files and copies the present state of this object (see get_state)
+        #  - func must be picklable, e.g. a module-level function or an OpenDSS method
+        cases = [case if isinstance(case, tuple) else (case,) for case in cases]
+        if processes is None:
+            processes = os.cpu_count() or 1
+        if processes == 1 or len(cases) <= 1:
+            return [func(self, *case, **kwargs) for case in cases]
+
+        # split cases into interleaved batches, a few per worker to balance the load
+        processes = min(processes, len(cases))
+        n_batches = min(len(cases), processes * 4)
+        batches = [cases[i::n_batches] for i in range(n_batches)]
+
+        init_args = (self.redirects, self.time_step, self.start_time, self.fail_on_error)
+        with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(init_args, self.get_state())) as pool:
+            batch_results = pool.map(_run_worker_batch, [func] * n_batches, batches, [kwargs] * n_batches)
+
+            results = [None] * len(cases)
+            for i, batch_result in enumerate(batch_results):
+                results[i::n_batches] = batch_result
+        return results
+
+    def get_state(self):
+        # Returns the circuit state that can change after compiling, as a picklable dict. Includes:
+        #  - Commands: commands run after compiling (including set_property), see run_command
+        #  - Properties: values of STATE_PROPERTIES for each element, e.g. load powers and regulator taps
+        #  - Storage: values of STORAGE_PROPERTIES for each storage element, e.g. state of charge
+        #  - Vsources: per-unit voltage and angle of each voltage source
+        #  - Open Terminals: open conductors of each element, see get_open_terminals
+        #  - Clock: simulation hour and seconds
+        properties = {}
+        for element, attributes in STATE_PROPERTIES.items():
+            cls = ELEMENT_CLASSES[element]
+            properties[element] = {}
+            idx = cls.First()
+            while idx:
+                properties[element][cls.Name()] = [getattr(cls, attribute)() for attribute in attributes]
+                idx = cls.Next()
+
+        storage = {}
+        dss.Circuit.SetActiveClass('Storage')
+        for name in dss.ActiveClass.AllNames():
+            all_properties = [p.lower() for p in self.get_all_properties(name, 'Storage')]
+            storage[name] = {p: dss.Properties.Value(str(all_properties.index(p.lower()) + 1))
+                             for p in STORAGE_PROPERTIES if p.lower() in all_properties}
+
+        vsources = {}
+        idx = dss.Vsources.First()
+        while idx:
+            vsources[dss.Vsources.Name()] = (dss.Vsources.PU(), dss.Vsources.AngleDeg())
+            idx = dss.Vsources.Next()
+
+        return {
+            'Commands': list(self.commands),
+            'Properties': properties,
+            'Storage': storage,
+            'Vsources': vsources,
+            'Open Terminals': self.get_open_terminals(),
+            'Clock': (dss.Solution.Hour(), dss.Solution.Seconds()),
+        }
+
+    def set_state(self, state):
+        # Copies a circuit state from get_state, e.g. from another OpenDSS object with the same redirect files
+        for cmd in state['Commands']:
+            self.run_command(cmd)
+
+        for element, values in state['Properties'].items():
+            cls = ELEMENT_CLASSES[element]
+            names = cls.AllNames()
+            for name, element_values in values.items():
+                if name not in names:
+                    continue
+                cls.Name(name)
+                for attribute, value in zip(STATE_PROPERTIES[element], element_values):
+                    getattr(cls, attribute)(value)
+
+        for name, storage_values in state['Storage'].items():
+            edits = ' '.join([f'{p}={value}' for p, value in storage_values.items()])
+            self.run_command(f'edit Storage.{name} {edits}', record=False)
+
+        for name, (pu, angle) in state['Vsources'].items():
+            dss.Vsources.Name(name)
+            dss.Vsources.PU(pu)
+            dss.Vsources.AngleDeg(angle)
+
+        # open and close conductors that differ from the state
+        open_terminals = state['Open Terminals']
+        present_open_terminals = self.get_open_terminals()
+        for element_name in set(open_terminals) | set(present_open_terminals):
+            target = set(open_terminals.get(element_name, []))
+            present = set(present_open_terminals.get(element_name, []))
+            dss.Circuit.SetActiveElement(element_name)
+            for term, phase in present - target:
+                dss.CktElement.Close(term, phase)
+            for term, phase in target - present:
+                dss.CktElement.Open(term, phase)
+
+        hour, seconds = state['Clock']
+        dss.Solution.Hour(hour)
+        dss.Solution.Seconds(seconds)
+
+    @staticmethod
+    def get_open_terminals():
+        # returns a dict of {element: [(terminal, conductor), ...]} for all elements with open conductors
+        open_terminals = {}
+        for element_name in dss.Circuit.AllElementNames():
+            dss.Circuit.SetActiveElement(element_name)
+            n_conductors = dss.CktElement.NumConductors()
+            is_open = [(term, phase) for term in range(1, dss.CktElement.NumTerminals() + 1)
+                       for phase in range(1, n_conductors + 1) if dss.CktElement.IsOpen(term, phase)]
+            if is_open:
+                open_terminals[element_name] = is_open
+        return open_terminals
+
     # GENERAL GET METHODS
 
     @staticmethod
@@ -116,6 +288,26 @@ class OpenDSS:
             # df = dss.utils.class_to_dataframe(element)
         return df
 
+    @staticmethod
+    def get_all_node_voltages():
+        # gets voltage magnitudes (in p.u.) of all nodes in a single call, as a Series indexed by node name
+        return pd.Series(dss.Circuit.AllBusMagPu(), index=dss.Circuit.AllNodeNames())
+
+    @staticmethod
+    def get_all_loadings():
+        # gets loading of all power delivery elements with a normal current rating, as a Series indexed by element
+        # loading is the maximum current magnitude of the first terminal, in percent of the normal rating
+        data = {}
+        idx = dss.PDElements.First()
+        while idx:
+            norm_amps = dss.CktElement.NormalAmps()
+            if norm_amps > 0:
+                n_conductors = dss.CktElement.NumConductors()
+                currents = dss.CktElement.CurrentsMagAng()[0:2 * n_conductors:2]
+                data[dss.CktElement.Name()] = max(currents) / norm_amps * 100
+            idx = dss.PDElements.Next()
+        return pd.Series(data, dtype=float)
+
     def get_circuit_voltage(self, pu=True):
         # gets circuit voltage magnitude and angle, returns a tuple of (magnitude, angle)
         # if pu is True, magnitude unit is p.u., otherwise unit is kV
@@ -348,7 +540,7 @@ class OpenDSS:
                 cls.kvar(q)
         elif element == 'Storage':
             if p == 0:
-                self.run_command(f'edit {element}.{name} kW=0 kvar=0 State=Idling')
+                self.run_command(f'edit {element}.{name} kW=0 kvar=0 State=Idling', record=False)
                 return
 
             if size is None:
@@ -363,9 +555,10 @@ class OpenDSS:
 
             if p < 0:
                 self.run_command(
-                    f'edit {element}.{name} %discharge={p_pct:.4} pf={pf:.4} State=Discharging')
+                    f'edit {element}.{name} %discharge={p_pct:.4} pf={pf:.4} State=Discharging', record=False)
             else:
-                self.run_command(f'edit {element}.{name} %charge={p_pct:.4} pf={pf:.4} State=Charging')
+                self.run_command(f'edit {element}.{name} %charge={p_pct:.4} pf={pf:.4} State=Charging',
+                                 record=False)
         else:
             raise OpenDSSException("Unknown element class:", element)
 
@@ -458,6 +651,11 @@ class OpenDSS:
         idx = all_properties.index(property_name)
         dss.Properties.Value(str(idx + 1), str(value))
 
+        # save as a command to replay in worker processes
+        if self.commands is not None:
+            value_str = f'"{value}"' if ' ' in str(value) else value
+            self.commands.append(f'edit {dss.Element.Name()} {property_name}={value_str}')
+
         new_value = self.get_property(name, property_name, element)
         assert new_value == value
 
@@ -497,6 +695,249 @@ class OpenDSS:
         self.set_element(name, 'CapControl')
         return float(dss.CapControls.PTRatio())
 
+    # CONTINGENCY METHODS
+
+    @staticmethod
+    def get_violations(voltages, loadings, v_min=0.95, v_max=1.05, max_loading=100):
+        # returns a tuple of Series: voltage violations (in p.u. outside of [v_min, v_max]) and loading violations
+        # (in percent above max_loading), for all nodes and elements
+        v_violations = (v_min - voltages).clip(lower=0) + (voltages - v_max).clip(lower=0)
+        l_violations = (loadings - max_loading).clip(lower=0)
+        return v_violations, l_violations
+
+    def evaluate_contingency(self, name, element='Line', base=None, v_min=0.95, v_max=1.05, max_loading=100):
+        # Opens an element, solves a snapshot (see run_snapshot), closes the element again, and re-solves the base
+        # case. Returns a dict with:
+        #  - Converged: False if the solution did not converge. Other results are only included if True
+        #  - Islanded Nodes: number of energized nodes that are de-energized by the outage
+        #  - Voltage: Series of new or worsened voltage violations (see get_violations), compared to the base case.
+        #    Islanded nodes have a violation of v_min
+        #  - Loading: Series of new or worsened loading violations, compared to the base case
+        # base is a tuple of (node voltages, element loadings) from the base case. If None, the base case is solved
+        # first. Changes below VOLTAGE_TOLERANCE and LOADING_TOLERANCE are ignored
+        if base is None:
+            self.run_snapshot()
+            base = self.get_all_node_voltages(), self.get_all_loadings()
+        base_voltages, base_loadings = base
+        energized = base_voltages >= ISLAND_VOLTAGE
+        base_v_violations, base_l_violations = self.get_violations(base_voltages[energized], base_loadings, v_min,
+                                                                   v_max, max_loading)
+
+        # open all phases of the first terminal
+        was_open = self.get_is_open(name, element, term=1)
+        if not was_open:
+            self.set_is_open(name, True, element, term=1)
+        try:
+            converged = self.run_snapshot()
+            if converged:
+                voltages = self.get_all_node_voltages()
+                loadings = self.get_all_loadings()
+        finally:
+            if not was_open:
+                self.set_is_open(name, False, element, term=1)
+            # restore the base solution
+            self.run_snapshot()
+
+        out = {'Contingency': f'{element}.{name}', 'Converged': converged}
+        if not converged:
+            return out
+
+        de_energized = voltages < ISLAND_VOLTAGE
+        islanded = de_energized & energized.reindex(voltages.index, fill_value=False)
+
+        # keep islanded nodes as violations, but not nodes that are de-energized in the base case
+        energized_voltages = voltages[~de_energized]
+        voltages = voltages[~de_energized | islanded]
+        v_violations, l_violations = self.get_violations(voltages, loadings, v_min, v_max, max_loading)
+        v_violations = v_violations - base_v_violations.reindex(v_violations.index, fill_value=0)
+        l_violations = l_violations - base_l_violations.reindex(l_violations.index, fill_value=0)
+        out.update({
+            'Islanded Nodes': int(islanded.sum()),
+            'Min Voltage (p.u.)': energized_voltages.min(),
+            'Max Voltage (p.u.)': energized_voltages.max(),
+            'Max Loading (%)': loadings.max(),
+            'Voltage': v_violations[v_violations > VOLTAGE_TOLERANCE],
+            'Loading': l_violations[l_violations > LOADING_TOLERANCE],
+        })
+        return out
+
+    def run_contingencies(self, elements=None, v_min=0.95, v_max=1.05, max_loading=100, processes=None):
+        # Runs an N-1 contingency screening, opening one element at a time at the present simulation time
+        #  - elements: list of (name, element) tuples. Default is all elements in LINE_CLASSES
+        #  - processes: number of worker processes, see run_parallel
+        # Returns a tuple of (violations, summary) DataFrames, both indexed by contingency:
+        #  - violations: matrix of new or worsened violations compared to the base case, with a (quantity, node/element
+        #    name) column for each node and element that is violated in any contingency. Quantities are 'Voltage'
+        #    (in p.u.) and 'Loading' (in %). Islanded nodes have a voltage violation of v_min
+        #  - summary: results of each contingency, ranked by severity (sum of voltage violations in percent and
+        #    loading violations). Non-converged cases have Converged=False, a Severity of NaN, and are ranked
+        #    first. Islanded cases have a nonzero number of Islanded Nodes
+        if elements is None:
+            elements = [(name, element) for element in LINE_CLASSES for name in ELEMENT_CLASSES[element].AllNames()]
+
+        if not self.run_snapshot():
+            raise OpenDSSException('Base case for contingency analysis did not converge')
+        base = self.get_all_node_voltages(), self.get_all_loadings()
+
+        results = self.run_parallel(OpenDSS.evaluate_contingency, elements, processes, base=base,
+                                    v_min=v_min, v_max=v_max, max_loading=max_loading)
+
+        summary = []
+        violations = {}
+        for result in results:
+            v_violations = result.pop('Voltage', pd.Series(dtype=float))
+            l_violations = result.pop('Loading', pd.Series(dtype=float))
+            if result['Converged']:
+                result['Violations'] = len(v_violations) + len(l_violations)
+                result['Severity'] = v_violations.sum() * 100 + l_violations.sum()
+            else:
+                result['Violations'] = np.nan
+                result['Severity'] = np.nan
+            violations[result['Contingency']] = pd.concat({'Voltage': v_violations, 'Loading': l_violations})
+            summary.append(result)
+
+        summary_columns = ['Contingency', 'Converged', 'Islanded Nodes', 'Min Voltage (p.u.)', 'Max Voltage (p.u.)',
+                           'Max Loading (%)', 'Violations', 'Severity']
+        summary = pd.DataFrame(summary, columns=summary_columns).set_index('Contingency')
+        summary = summary.sort_values('Severity', ascending=False, na_position='first')
+
+        if violations:
+            violations = pd.DataFrame.from_dict(violations, orient='index')
+        else:
+            violations = pd.DataFrame()
+        violations = violations.reindex(summary.index).fillna(0).astype(np.float32)
+        return violations, summary
+
+    # RECORDING METHODS
+
+    def add_monitor(self, name, element='Load', mode='VI', terminal=1):
+        # Creates an OpenDSS monitor on an element and returns the monitor name
+        #  - mode is a key of MONITOR_MODES or an OpenDSS mode number (e.g. 'Power' or 1, 17 for sequence powers)
+        #  - monitors sample every time step solved with run_dss (not with no_controls=True)
+        if isinstance(mode, str):
+            if mode not in MONITOR_MODES:
+                raise OpenDSSException(f'Unknown monitor mode: {mode}')
+            mode = MONITOR_MODES[mode]
+        self.set_element(name, element)
+        element_name = dss.CktElement.Name()
+
+        monitor_name = f'{element_name}_{mode}_{terminal}'.replace('.', '_').lower()
+        if monitor_name not in self.monitors:
+            self.run_command(f'New Monitor.{monitor_name} element={element_name} terminal={terminal} mode={mode}')
+            self.monitors[monitor_name] = element_name
+        return monitor_name
+
+    def add_energy_meter(self, name, element='Line', terminal=1):
+        # Creates an OpenDSS energy meter on an element and returns the meter name
+        self.set_element(name, element)
+        element_name = dss.CktElement.Name()
+
+        meter_name = f'{element_name}_{terminal}'.replace('.', '_').lower()
+        if meter_name not in self.energy_meters:
+            self.run_command(f'New EnergyMeter.{meter_name} element={element_name} terminal={terminal}')
+            self.energy_meters[meter_name] = element_name
+        return meter_name
+
+    def add_recorders(self, recorders):
+        # Creates monitors and energy meters from a list of recorders, returns a list of the recorder names
+        # Each recorder is a dict with keys:
+        #  - name: element name (required)
+        #  - element: element class (default='Load')
+        #  - mode: monitor mode, see add_monitor (default='VI')
+        #  - terminal: element terminal (default=1)
+        #  - type: 'Monitor' or 'EnergyMeter' (default='Monitor')
+        # or a tuple of (name, element, mode, terminal)
+        names = []
+        for recorder in recorders:
+            if not isinstance(recorder, dict):
+                recorder = dict(zip(['name', 'element', 'mode', 'terminal'], recorder))
+            recorder = recorder.copy()
+            recorder_type = recorder.pop('type', 'Monitor')
+            if recorder_type == 'Monitor':
+                names.append(self.add_monitor(**recorder))
+            elif recorder_type == 'EnergyMeter':
+                recorder.pop('mode', None)
+                names.append(self.add_energy_meter(**recorder))
+            else:
+                raise OpenDSSException(f'Unknown recorder type: {recorder_type}')
+        return names
+
+    @staticmethod
+    def parse_monitor_stream(stream):
+        # Converts a monitor byte stream to a 2D array with one row per sample: (hour, seconds, channel 1, ...)
+        if isinstance(stream, (bytes, bytearray)):
+            buffer = np.frombuffer(stream, dtype=np.int8)
+        else:
+            buffer = np.asarray(stream, dtype=np.int8)
+        if len(buffer) < MONITOR_HEADER_SIZE:
+            return np.zeros((0, 2), dtype=np.float32)
+
+        record_size = int(buffer[:16].view(np.int32)[2]) + 2
+        data = buffer[MONITOR_HEADER_SIZE:].view(np.float32)
+        return data.reshape(-1, record_size)
+
+    def get_monitor_data(self, monitor_names=None, as_array=False, reset=False):
+        # Extracts monitor buffers in bulk. By default, reads all monitors created by the wrapper
+        #  - Returns a DataFrame with a time index and a (monitor name, channel) column for each monitor channel
+        #  - If as_array=True: returns a dict of {monitor name: (times, data)} numpy arrays
+        #  - If reset=True: clears the monitor buffers after reading, e.g. to extract results in chunks
+        # Times follow the time steps of run_dss: the first run_dss after initialization is labeled start_time
+        if monitor_names is None:
+            monitor_names = list(self.monitors.keys())
+
+        # the OpenDSS clock starts at the hour of start_time and advances by time_step before each solve
+        start_hour = self.start_time.replace(minute=0, second=0, microsecond=0)
+        offset = np.timedelta64(self.start_time - start_hour - self.time_step).astype('timedelta64[ms]')
+        year_start = np.datetime64(dt.datetime(self.start_time.year, 1, 1), 'ms') + offset
+
+        arrays = {}
+        for monitor_name in monitor_names:
+            dss.Monitors.Name(monitor_name)
+            dss.Monitors.Save()  # write any buffered samples to the monitor stream
+            records = self.parse_monitor_stream(dss.Monitors.ByteStream())
+            seconds = records[:, 0].astype(np.float64) * 3600 + records[:, 1]
+            times = year_start + np.round(seconds * 1000).astype('timedelta64[ms]')
+            arrays[monitor_name] = (times, records[:, 2:])
+            if reset:
+                dss.Monitors.Reset()
+
+        if as_array:
+            return arrays
+
+        dfs = {}
+        for monitor_name, (times, data) in arrays.items():
+            dss.Monitors.Name(monitor_name)
+            channels = [channel.strip() for channel in dss.Monitors.Header()]
+            if len(channels) != data.shape[1]:
+                channels = [f'Channel {i + 1}' for i in range(data.shape[1])]
+            dfs[monitor_name] = pd.DataFrame(data, index=pd.DatetimeIndex(times, name='Time'), columns=channels)
+        if not dfs:
+            return pd.DataFrame()
+        return pd.concat(dfs, axis=1)
+
+    def get_energy_meter_data(self, meter_names=None, reset=False):
+        # Returns a DataFrame of energy meter registers, with one row per meter and one column per register
+        # By default, reads all energy meters created by the wrapper. If reset=True, resets the meter registers
+        if meter_names is None:
+            meter_names = list(self.energy_meters.keys())
+
+        data = {}
+        for meter_name in meter_names:
+            dss.Meters.Name(meter_name)
+            data[meter_name] = dict(zip(dss.Meters.RegisterNames(), dss.Meters.RegisterValues()))
+            if reset:
+                dss.Meters.Reset()
+        return pd.DataFrame.from_dict(data, orient='index')
+
+    def reset_recorders(self):
+        # Clears the buffers of all monitors and energy meters created by the wrapper
+        for monitor_name in self.monitors:
+            dss.Monitors.Name(monitor_name)
+            dss.Monitors.Reset()
+        for meter_name in self.energy_meters:
+            dss.Meters.Name(meter_name)
+            dss.Meters.Reset()
+
     def print(self, *msg):
         print(f'{dt.datetime.now()} - {self.name}:', *msg)
 
@@ -505,3 +946,18 @@ class OpenDSS:
             raise OpenDSSException(*msg)
         else:
             self.print(*msg)
+
+
+# Worker process functions for OpenDSS.run_parallel
+_worker_feeder = None
+
+
+def _init_worker(init_args, state):
+    # compiles a copy of the circuit in the worker process and copies the parent state
+    global _worker_feeder
+    _worker_feeder = OpenDSS(*init_args)
+    _worker_feeder.set_state(state)
+
+
+def _run_worker_batch(func, cases, kwargs):
+    return [func(_worker_feeder, *case, **kwargs) for case in cases]
@@ -0,0 +1,205 @@
+"""
+Input profile pipeline that reads large load and PV profiles in chunks, aligned to the simulation time steps
+"""
+
+import os
+import queue
+import threading
+import numpy as np
+import pandas as pd
+
+from .OpenDSS import OpenDSSException
+
+RESAMPLE_METHODS = [
+    'ffill',  # latest profile value at or before each time step
+    'interpolate',  # linear interpolation between profile values
+    'mean',  # average of profile values within each time step
+]
+
+
+class ProfilePipeline:
+    def __init__(self, feeder, filename, columns, element='Load', end_time=None, method='ffill', chunk_size=100000,
+                 prefetch=2, time_column=None, data_start=None, data_time_step=None):
+        # Reads profiles from a CSV, Parquet, or .npy file in chunks and yields one setpoint array per time step
+        #  - columns: dict of {file column: element name}. For .npy files, the file columns are column indices
+        #  - Time steps start at feeder.start_time with a resolution of feeder.time_step, and end before end_time or
+        #    at the end of the profile data
+        #  - method: resampling method, see RESAMPLE_METHODS
+        #  - chunk_size: number of rows to read at once. Up to prefetch chunks are read on a background thread
+        #  - Profile times are read from time_column (default: first column of CSV files, index of Parquet files).
+        #    If data_start and data_time_step are given, the profile rows are evenly spaced instead (required for
+        #    .npy files, which are memory-mapped)
+        if method not in RESAMPLE_METHODS:
+            raise OpenDSSException(f'Unknown resample method: {method}')
+        if (data_start is None) != (data_time_step is None):
+            raise OpenDSSException('Both data_start and data_time_step are required for evenly spaced profiles')
+
+        self.feeder = feeder
+        self.filename = filename
+        self.columns = list(columns.keys())
+        self.element_names = list(columns.values())
+        self.element = element
+        self.method = method
+        self.chunk_size = chunk_size
+        self.prefetch = prefetch
+        self.time_column = time_column
+        self.data_start = pd.Timestamp(data_start) if data_start is not None else None
+        self.data_time_step = pd.Timedelta(data_time_step) if data_time_step is not None else None
+
+        self.start_time = pd.Timestamp(feeder.start_time)
+        self.time_step = pd.Timedelta(feeder.time_step)
+        self.end_time = pd.Timestamp(end_time) if end_time is not None else None
+
+        extension = os.path.splitext(filename)[1].lower()
+        if extension == '.csv':
+            self.reader = self.read_csv
+        elif extension in ['.parquet', '.pq']:
+            self.reader = self.read_parquet
+        elif extension == '.npy':
+            if self.data_start is None:
+                raise OpenDSSException('data_start and data_time_step are required for .npy profiles')
+            self.reader = self.read_npy
+        else:
+            raise OpenDSSException(f'Unknown profile file type: {filename}')
+
+    def __iter__(self):
+        # Yields a tuple of (time, setpoints) for each time step, with setpoints in the order of element_names
+        chunks = queue.Queue(maxsize=self.prefetch)
+        stop = threading.Event()
+        thread = threading.Thread(target=self.prefetch_chunks, args=(chunks, stop), daemon=True)
+        thread.start()
+
+        next_time = self.start_time
+        buffer = None
+        try:
+            while self.end_time is None or next_time < self.end_time:
+                chunk = chunks.get()
+                if isinstance(chunk, Exception):
+                    raise chunk
+                final = chunk is None
+                if not final and not len(chunk):
+                    continue
+                if not final:
+                    if buffer is None and chunk.index[0] > next_time:
+                        raise OpenDSSException(f'Profile data in {self.filename} starts after {next_time}')
+                    buffer = chunk if buffer is None else pd.concat([buffer, chunk])
+                if buffer is None:
+                    break
+
+                times, values = self.align(buffer, next_time, final)
+                for t, setpoints in zip(times, values):
+                    yield t, setpoints
+                if len(times):
+                    next_time = times[-1] + self.time_step
+
+                # only keep the latest row at or before the next time step, and any later rows
+                start = max(buffer.index.searchsorted(next_time, side='right') - 1, 0)
+                buffer = buffer.iloc[start:]
+                if final:
+                    break
+        finally:
+            stop.set()
+
+    def align(self, buffer, next_time, final=False):
+        # Returns time steps from next_time that are covered by the buffer, and an array of their setpoints
+        # Unless final=True, a time step is only covered when the buffer includes data after it (or after the
+        # end of the time step, if method='mean')
+        last = buffer.index[-1]
+        if self.method == 'mean' and not final:
+            last -= self.time_step
+        if self.end_time is not None:
+            last = min(last, self.end_time - pd.Timedelta(1, 'ns'))
+        n_steps = (last - next_time) // self.time_step + 1 if last >= next_time else 0
+        times = pd.date_range(next_time, periods=n_steps, freq=self.time_step)
+        if not n_steps:
+            return times, np.zeros((0, len(self.columns)))
+
+        values = buffer.reindex(times, method='ffill')
+        if self.method == 'interpolate':
+            combined = buffer.reindex(buffer.index.union(times))
+            values = combined.interpolate('time', limit_area='inside').reindex(times).fillna(values)
+        elif self.method == 'mean':
+            # average within each time step, or latest value if there is no data within the time step
+            bins = (buffer.index - self.start_time) // self.time_step
+            means = buffer.groupby(bins).mean()
+            means = means.reindex((times - self.start_time) // self.time_step)
+            means.index = times
+            values = means.fillna(values)
+        return times, values.to_numpy(dtype=float)
+
+    def prefetch_chunks(self, chunks, stop):
+        # Runs on a background thread: reads chunks into a queue, followed by None or an exception
+        def put(item):
+            while not stop.is_set():
+                try:
+                    chunks.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        try:
+            for chunk in self.reader():
+                if not put(chunk):
+                    return
+            put(None)
+        except Exception as e:
+            put(e)
+
+    def get_index(self, start_row, n_rows):
+        # returns times for evenly spaced profile rows
+        return self.data_start + self.data_time_step * np.arange(start_row, start_row + n_rows)
+
+    def get_first_row(self):
+        # returns the last evenly spaced profile row at or before the start time
+        return max((self.start_time - self.data_start) // self.data_time_step, 0)
+
+    def format_chunk(self, df, start_row):
+        # sets the chunk time index and orders the columns by element
+        if self.data_start is not None:
+            df.index = self.get_index(start_row, len(df))
+        else:
+            df.index = pd.DatetimeIndex(pd.to_datetime(df.pop(self.time_column)))
+        return df[self.columns].astype(float)
+
+    def read_csv(self):
+        if self.data_start is None and self.time_column is None:
+            self.time_column = pd.read_csv(self.filename, nrows=0).columns[0]
+        usecols = self.columns if self.data_start is not None else self.columns + [self.time_column]
+
+        row = 0
+        for df in pd.read_csv(self.filename, usecols=usecols, chunksize=self.chunk_size):
+            yield self.format_chunk(df, row)
+            row += len(df)
+
+    def read_parquet(self):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise OpenDSSException('pyarrow is required to read Parquet profiles')
+
+        parquet_file = pq.ParquetFile(self.filename)
+        if self.data_start is None and self.time_column is None:
+            index_columns = (parquet_file.schema_arrow.pandas_metadata or {}).get('index_columns', [])
+            index_columns = [column for column in index_columns if isinstance(column, str)]
+            if not index_columns:
+                raise OpenDSSException(f'No time column or index found in {self.filename}')
+            self.time_column = index_columns[0]
+        columns = self.columns if self.data_start is not None else self.columns + [self.time_column]
+
+        row = 0
+        for batch in parquet_file.iter_batches(batch_size=self.chunk_size, columns=columns):
+            df = batch.to_pandas(ignore_metadata=True)
+            yield self.format_chunk(df, row)
+            row += len(df)
+
+    def read_npy(self):
+        data = np.load(self.filename, mmap_mode='r')
+        for row in range(self.get_first_row(), len(data), self.chunk_size):
+            values = np.asarray(data[row: row + self.chunk_size, self.columns], dtype=float)
+            yield pd.DataFrame(values, index=self.get_index(row, len(values)), columns=self.columns)
+
+    def set_powers(self, setpoints):
+        # sets the power of each element, see OpenDSS.set_power
+        for name, p in zip(self.element_names, setpoints):
+            self.feeder.set_power(name, p=p, element=self.element)
@@ -1,3 +1,5 @@
 from .OpenDSS import OpenDSS
+from .HostingCapacity import get_hosting_capacity, get_bus_hosting_capacity
+from .Profiles import ProfilePipeline
 
 __version__ = '1.7'